@@ -1,6 +1,9 @@
-# import asyncio
+import os
+import sys
+import asyncio
 from typing import Optional
 import logging
+import orjson
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
@@ -18,10 +21,56 @@ logging.basicConfig(
 
 load_dotenv()  # Load environment variables from .env file
 
+# Bytes read from stdin but not yet returned by _ainput
+_stdin_buffer = bytearray()
+
+
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop.
+
+    Waits for stdin with `loop.add_reader` so no thread is left blocked in a read,
+    and Ctrl+C exits immediately. Falls back to a worker thread where readers are unsupported.
+
+    Args:
+        prompt (str): Text shown before reading.
+
+    Returns:
+        str: The line read, without the trailing newline.
+    """
+    loop = asyncio.get_running_loop()
+    print(prompt, end="", flush=True)
+    fd = sys.stdin.fileno()
+
+    while b"\n" not in _stdin_buffer:
+        readable = loop.create_future()
+        try:
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        except (NotImplementedError, PermissionError):
+            return await asyncio.to_thread(input)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            if not _stdin_buffer:
+                raise EOFError("EOF when reading a line")
+            break
+        _stdin_buffer.extend(chunk)
+
+    line, _, rest = bytes(_stdin_buffer).partition(b"\n")
+    _stdin_buffer[:] = rest
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
 class MCPClient:
     def __init__(self):
         """Initialize session and LLM Client."""
         self.session: Optional[ClientSession] = None
+        self.tools: list = []
+        self.tools_formatted: str = ""
+        self.passthrough_tools: set[str] = set()
         self.exit_stack = AsyncExitStack()
 
     async def connect_to_server(self, server_script_path: str):
@@ -50,8 +99,20 @@ class MCPClient:
 
         # List all available tools
         tools_result = await self.session.list_tools()
-        tools = tools_result.tools
-        logging.info(f"Connected to server with tools: {', '.join(tool.name for tool in tools)}")
+        self.tools = tools_result.tools
+        logging.info(f"Connected to server with tools: {', '.join(tool.name for tool in self.tools)}")
+
+        # Tools the server marks as returning user-ready output
+        self.passthrough_tools = {
+            t.name for t in self.tools
+            if t.annotations is not None and getattr(t.annotations, "passthrough", False)
+        }
+
+        # Format tool definitions once for use in every LLM prompt
+        self.tools_formatted = "\n".join(
+            HelperFunctions.format_tool(t.name, t.description, t.inputSchema)
+            for t in self.tools
+        )
 
     async def cleanup(self):
         """Clean up resources"""
@@ -62,55 +123,104 @@ class MCPClient:
 async def start_chat(server_script_path: str):
     """Start an interactive chat session using MCP client and LLM interface."""
     mcp_client = MCPClient()
+    llm_interface: Optional[LLMInterface] = None
+    warmup_task: Optional[asyncio.Task] = None
     try:
+        # Warm the LLM connection in the background while the MCP server starts up
+        llm_interface = LLMInterface()
+        warmup_task = asyncio.create_task(llm_interface.warm_up())
+
         await mcp_client.connect_to_server(server_script_path)
 
-        tools_response = await mcp_client.session.list_tools()
-        tools = tools_response.tools
-        tools_formatted = "\n".join(
-            f"{HelperFunctions.format_tool(t.name, t.description, t.inputSchema)}"
-            for t in tools
-        )
+        tools_formatted = mcp_client.tools_formatted
+        streamed = False
 
-        llm_interface = LLMInterface()
+        def print_message_delta(delta: str) -> None:
+            """Print the assistant's message as it streams in."""
+            nonlocal streamed
+            if not streamed:
+                print("\n\nAssistant:\n", end="")
+                streamed = True
+            print(delta, end="", flush=True)
 
         while True:
-            user_query = input("\nEnter your query (type 'exit' to leave the chat):\n")
+            # Read input without blocking the event loop
+            user_query = await _ainput("\nEnter your query (type 'exit' to leave the chat):\n")
             if user_query.lower() in ("exit", "quit"):
                 break
             
+            streamed = False
             llm_interface.history.append({"role": "user", "content": user_query})
             llm_response = await llm_interface.get_llm_response(
-                tools_description=tools_formatted
+                tools_description=tools_formatted, on_message_delta=print_message_delta
             )
-            parsed_response = await llm_interface.process_llm_response(
+            parsed_response = llm_interface.process_llm_response(
                 llm_response=llm_response
             )
 
             if parsed_response.get("tool_call"):
                 tool_calls = parsed_response.get("tool_call_data", [])
-                # Execute tool calls
+                # Deduplicate identical calls, keyed on tool name and canonical arguments
+                keys = [
+                    (tc.get("tool"), orjson.dumps(tc.get("arguments"), option=orjson.OPT_SORT_KEYS))
+                    for tc in tool_calls
+                ]
+                unique_calls = dict(zip(keys, tool_calls))
+
+                # Execute unique tool calls concurrently
+                results = await asyncio.gather(
+                    *(
+                        mcp_client.session.call_tool(tc.get("tool"), tc.get("arguments"))
+                        for tc in unique_calls.values()
+                    ),
+                    return_exceptions=True,
+                )
+                results_by_key = dict(zip(unique_calls, results))
+
                 tool_results = []
-                for tool_call in tool_calls:
-                    tool_name = tool_call.get("tool")
-                    tool_args = tool_call.get("arguments")
-                    result = await mcp_client.session.call_tool(tool_name, tool_args)
-                    tool_results.append(result.content[0].text)
+                passthrough = True
+                for tool_name, args_key in keys:
+                    result = results_by_key[(tool_name, args_key)]
+                    if isinstance(result, Exception):
+                        logging.error(f"Error calling tool '{tool_name}': {result}")
+                        passthrough = False
+                        continue
+                    result_text = result.content[0].text
+                    tool_results.append(result_text)
+                    if result.isError or tool_name not in mcp_client.passthrough_tools:
+                        passthrough = False
 
                 llm_interface.history.append(
                     {"role": "system", "content": f"{tool_results=}"}
                 )
 
-                # Re-query the LLM with tool results
-                llm_response = await llm_interface.get_llm_response(
-                    tools_description=tools_formatted
-                )
-                parsed_response = await llm_interface.process_llm_response(
-                    llm_response=llm_response
-                )
+                # Show passthrough results directly, skipping the second LLM round-trip
+                if passthrough and tool_results:
+                    passthrough_message = "\n\n".join(dict.fromkeys(tool_results))
+                    llm_interface.history.append(
+                        {"role": "assistant", "content": f"<user_message>\n{passthrough_message}\n</user_message>"}
+                    )
+                    parsed_response = {"tool_call": False, "message_to_user": passthrough_message}
+                else:
+                    # Re-query the LLM with tool results
+                    llm_response = await llm_interface.get_llm_response(
+                        tools_description=tools_formatted, on_message_delta=print_message_delta
+                    )
+                    parsed_response = llm_interface.process_llm_response(
+                        llm_response=llm_response
+                    )
 
             user_message = parsed_response.get("message_to_user")
-            if user_message:
+            if streamed:
+                print("\n")
+            elif user_message:
                 print(f"\n\nAssistant:\n{user_message}\n")
+
+            # Keep the LLM connection warm while the user types the next query
+            warmup_task = asyncio.create_task(llm_interface.warm_up())
     finally:
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+        if llm_interface is not None:
+            llm_interface.close()
         await mcp_client.cleanup()
\ No newline at end of file
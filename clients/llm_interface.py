@@ -1,8 +1,13 @@
 from groq import AsyncGroq
 import os
 import re
-import json
+import time
+import orjson
+import sqlite3
+import hashlib
 import logging
+from collections import OrderedDict, deque
+from typing import Callable
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -12,6 +17,10 @@ logging.basicConfig(
 )
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/mcp-quickstart/llm.sqlite3")
+# Disk cache entries older than this (seconds) or beyond this count are pruned
+DEFAULT_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+DEFAULT_CACHE_MAX_ROWS = 1000
 
 if not GROQ_API_KEY:          # None or empty string
     raise RuntimeError(
@@ -19,12 +28,284 @@ if not GROQ_API_KEY:          # None or empty string
         "Export it (e.g., `export GROQ_API_KEY=...`) before running."
     )
 
+# Process-wide Groq client so the HTTP connection pool is shared across sessions
+_shared_client: AsyncGroq | None = None
+
+
+def _get_client() -> AsyncGroq:
+    """Return the shared Groq client, creating it on first call."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncGroq(api_key=GROQ_API_KEY)
+    return _shared_client
+
+
+async def close_client() -> None:
+    """Close the shared Groq client and release its connection pool."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
+# Precompiled patterns for the XML-like tags the LLM is instructed to emit,
+# tolerant of stray whitespace inside the tags
+_TAG_PATTERNS = {
+    "tool_call": re.compile(r"<\s*tool_call\s*>(.*?)<\s*/\s*tool_call\s*>", re.DOTALL),
+    "user_message": re.compile(r"<\s*user_message\s*>(.*?)<\s*/\s*user_message\s*>", re.DOTALL),
+}
+
+# Static parts of the system prompt, surrounding the tools description
+_SYSTEM_PREFIX = "You are a helpful assistant with access to the following tools:\n"
+
+_SYSTEM_SUFFIX = (
+    "## Decision rules:\n"
+    "1. If the user's request can be answered without using any tool, respond **only** using the <user_message>...</user_message> tags.\n"
+    "2. If the request requires one or more tools, respond **only** using a single <tool_call>...</tool_call> block (see format below). "
+    "In this case, do **not** include a <user_message> block.\n"
+    "3. A response must contain **either** a <tool_call> block **or** a <user_message> block—**never both**.\n\n"
+    "## Tool call format:\n"
+    "<tool_call>\n"
+    "[\n"
+    "  {\n"
+    '    "tool": "tool-name",\n'
+    '    "arguments": {\n'
+    '      "argument-name": "value"\n'
+    "    }\n"
+    "  },\n"
+    "  ... (add more tool calls if needed)\n"
+    "]\n"
+    "</tool_call>\n\n"
+    "## User message format:\n"
+    "<user_message>\n"
+    "Your natural language reply to the user goes here.\n"
+    "</user_message>\n\n"
+    "## Constraints:\n"
+    "- Do **not** include any explanation or text outside of <tool_call> or <user_message> tags.\n"
+    "- Use **only** the tools explicitly listed above.\n\n"
+    "- Always include both the opening and closing tags for <user_message> or <tool_call>. Responses with missing tags are invalid.\n"
+    "**IMPORTANT** - After receiving a tool's response, provide a final answer to the user in a friendly, natural language format using <user_message> tags. Do not include unnecessary details—respond only with information relevant to the user's original question."
+)
+
+
+def _extract_tag(text: str, tag: str) -> str | None:
+    """Extract the content of the first <tag>...</tag> block using plain string search.
+
+    Args:
+        text (str): Text to search.
+        tag (str): Tag name without angle brackets.
+
+    Returns:
+        str | None: Stripped content between the tags, or None if the block is incomplete.
+    """
+    open_tag = f"<{tag}>"
+    start = text.find(open_tag)
+    if start == -1:
+        return None
+    start += len(open_tag)
+    end = text.find(f"</{tag}>", start)
+    if end == -1:
+        return None
+    return text[start:end].strip()
+
+
+def _partial_message(text: str) -> str:
+    """Return the part of a user message that is safe to show from a partial response.
+
+    Args:
+        text (str): Response text received so far.
+
+    Returns:
+        str: Stripped message text, holding back a partially received closing tag.
+    """
+    open_tag, close_tag = "<user_message>", "</user_message>"
+    start = text.find(open_tag)
+    if start == -1:
+        return ""
+    start += len(open_tag)
+
+    end = text.find(close_tag, start)
+    if end == -1:
+        end = len(text)
+        lt = text.rfind("<", start)
+        if lt != -1 and close_tag.startswith(text[lt:]):
+            end = lt
+    return text[start:end].strip()
+
 class LLMInterface:
-    def __init__(self):
-        self.client = AsyncGroq(api_key=GROQ_API_KEY)
-        self.history = []
+    def __init__(
+        self,
+        cache_size: int = 128,
+        max_history_msgs: int = 20,
+        cache_path: str | None = DEFAULT_CACHE_PATH,
+        cache_max_age: float = DEFAULT_CACHE_MAX_AGE,
+        cache_max_rows: int = DEFAULT_CACHE_MAX_ROWS,
+    ):
+        self.client = _get_client()
+        self.max_history_msgs = max_history_msgs
+        # Bounded window of recent messages; the oldest are dropped on append
+        self.history: deque[dict] = deque(maxlen=max_history_msgs)
+        # LRU cache of LLM responses keyed by prompt state
+        self._resp_cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_size = cache_size
+        # On-disk cache shared across sessions, or None if persistence is disabled
+        self._cache_max_age = cache_max_age
+        self._disk_cache = (
+            self._open_disk_cache(cache_path, cache_max_age, cache_max_rows) if cache_path else None
+        )
+
+    @staticmethod
+    def _open_disk_cache(cache_path: str, max_age: float, max_rows: int) -> sqlite3.Connection | None:
+        """Open (creating if needed) the SQLite database backing the response cache and prune it.
 
-    async def _parse_llm_response(self, llm_response: str, tag: str) -> str | dict | None:
+        Args:
+            cache_path (str): Path to the SQLite database file.
+            max_age (float): Entries older than this many seconds are deleted.
+            max_rows (int): Only the newest `max_rows` entries are kept.
+
+        Returns:
+            sqlite3.Connection | None: Open connection, or None if the cache is unavailable.
+        """
+        conn = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            conn = sqlite3.connect(cache_path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - max_age,))
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key NOT IN "
+                "(SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT ?)",
+                (max_rows,),
+            )
+            conn.commit()
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"LLM response disk cache disabled: {e}")
+            if conn is not None:
+                conn.close()
+            return None
+
+    def close(self) -> None:
+        """Close the on-disk response cache."""
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def _cache_get(self, key: str) -> str | None:
+        """Look up a cached response, checking memory first and then disk.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            str | None: Cached response, or None on a miss.
+        """
+        if key in self._resp_cache:
+            self._resp_cache.move_to_end(key)
+            return self._resp_cache[key]
+
+        if self._disk_cache is None:
+            return None
+        try:
+            row = self._disk_cache.execute(
+                "SELECT content FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self._cache_max_age),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Error reading LLM response cache: {e}")
+            return None
+        if row is None:
+            return None
+
+        self._cache_put(key, row[0], persist=False)
+        return row[0]
+
+    def _cache_put(self, key: str, content: str, persist: bool = True) -> None:
+        """Store a response in the in-memory cache and, optionally, on disk.
+
+        Args:
+            key (str): Cache key.
+            content (str): LLM response to cache.
+            persist (bool): Also write the response to the disk cache.
+        """
+        self._resp_cache[key] = content
+        self._resp_cache.move_to_end(key)
+        if len(self._resp_cache) > self._cache_size:
+            self._resp_cache.popitem(last=False)
+
+        if persist and self._disk_cache is not None:
+            try:
+                self._disk_cache.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, content, created_at) VALUES (?, ?, ?)",
+                    (key, content, time.time()),
+                )
+                self._disk_cache.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Error writing LLM response cache: {e}")
+
+    def _cache_key(self, system_message: str) -> str:
+        """Build a cache key from the system prompt and conversation history.
+
+        Args:
+            system_message (str): System prompt sent with the request.
+
+        Returns:
+            str: Hex digest identifying the prompt state.
+        """
+        payload = orjson.dumps([system_message, list(self.history)], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _trim_history(self) -> None:
+        """Drop leading messages whose user turn has been evicted from the window."""
+        if len(self.history) < self.max_history_msgs:
+            return
+        if not any(message.get("role") == "user" for message in self.history):
+            return
+
+        while self.history[0].get("role") != "user":
+            self.history.popleft()
+
+    async def _read_stream(self, stream, on_message_delta: Callable[[str], None] | None = None) -> str:
+        """Accumulate a streamed completion, forwarding user message text as it arrives.
+
+        The stream is always read to the end so its connection can return to the pool.
+
+        Args:
+            stream: Async stream of chat completion chunks.
+            on_message_delta (Callable[[str], None] | None): Called with each new piece of
+                the <user_message> text.
+
+        Returns:
+            str: Complete completion text.
+        """
+        text = ""
+        sent = 0  # Characters of the user message already forwarded
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            text += delta
+
+            if on_message_delta is not None:
+                message = _partial_message(text)
+                if len(message) > sent:
+                    on_message_delta(message[sent:])
+                    sent = len(message)
+        return text
+
+    async def warm_up(self) -> None:
+        """Issue a cheap request to keep the Groq HTTP connection pool warm."""
+        try:
+            await self.client.with_options(timeout=1.0, max_retries=0).models.list()
+        except Exception as e:
+            logging.debug(f"LLM connection warm-up failed: {e}")
+
+    def _parse_llm_response(self, llm_response: str, tag: str) -> str | dict | None:
         """Parse LLM response enclosed in specific XML-like tags.
 
         Args:
@@ -36,17 +317,22 @@ class LLMInterface:
         """
 
         try:
-            pattern = fr"<{tag}>(.*?)</{tag}>"
-            match = re.search(pattern, llm_response, re.DOTALL)
-
-            if not match:
+            pattern = _TAG_PATTERNS.get(tag)
+            if pattern is None:
                 return None
 
-            parsed_data = match.group(1).strip()
+            # Fast path for well-formed responses, regex only as a fallback
+            parsed_data = _extract_tag(llm_response, tag)
+            if parsed_data is None:
+                match = pattern.search(llm_response)
+                if not match:
+                    return None
+                parsed_data = match.group(1).strip()
+
             if tag == "tool_call":
                 try:
-                    return json.loads(parsed_data)
-                except json.JSONDecodeError as json_err:
+                    return orjson.loads(parsed_data)
+                except orjson.JSONDecodeError as json_err:
                     logging.error(f"JSON decode error in tool_call: {json_err}")
                     return None
 
@@ -57,64 +343,58 @@ class LLMInterface:
             logging.error(f"Error occurred during LLM response parsing: {e}")
             return None
     
-    async def get_llm_response(self, tools_description: str) -> str:
+    async def get_llm_response(
+        self,
+        tools_description: str,
+        use_cache: bool = True,
+        on_message_delta: Callable[[str], None] | None = None,
+    ) -> str:
         """Get LLM response from LLM using tool-aware prompt.
 
         Args:
-            query (str): User query string.
             tools_description (str): Description of available tools.
+            use_cache (bool): Reuse a previous response for an identical prompt state.
+            on_message_delta (Callable[[str], None] | None): Called with <user_message> text
+                as it streams in, or once with the whole message on a cache hit.
         """
         try:
-            system_message = (
-                "You are a helpful assistant with access to the following tools:\n"
-                f"{tools_description}\n\n"
-                "## Decision rules:\n"
-                "1. If the user's request can be answered without using any tool, respond **only** using the <user_message>...</user_message> tags.\n"
-                "2. If the request requires one or more tools, respond **only** using a single <tool_call>...</tool_call> block (see format below). "
-                "In this case, do **not** include a <user_message> block.\n"
-                "3. A response must contain **either** a <tool_call> block **or** a <user_message> block—**never both**.\n\n"
-                "## Tool call format:\n"
-                "<tool_call>\n"
-                "[\n"
-                "  {\n"
-                '    "tool": "tool-name",\n'
-                '    "arguments": {\n'
-                '      "argument-name": "value"\n'
-                "    }\n"
-                "  },\n"
-                "  ... (add more tool calls if needed)\n"
-                "]\n"
-                "</tool_call>\n\n"
-                "## User message format:\n"
-                "<user_message>\n"
-                "Your natural language reply to the user goes here.\n"
-                "</user_message>\n\n"
-                "## Constraints:\n"
-                "- Do **not** include any explanation or text outside of <tool_call> or <user_message> tags.\n"
-                "- Use **only** the tools explicitly listed above.\n\n"
-                "- Always include both the opening and closing tags for <user_message> or <tool_call>. Responses with missing tags are invalid.\n"
-                "**IMPORTANT** - After receiving a tool's response, provide a final answer to the user in a friendly, natural language format using <user_message> tags. Do not include unnecessary details—respond only with information relevant to the user's original question."
-            )
+            self._trim_history()
+
+            system_message = f"{_SYSTEM_PREFIX}{tools_description}\n\n{_SYSTEM_SUFFIX}"
 
-            messages = [{"role": "system", "content":system_message}]
-            messages.extend(self.history)
+            key = self._cache_key(system_message)
+            if use_cache:
+                content = self._cache_get(key)
+                if content is not None:
+                    message = _partial_message(content)
+                    if on_message_delta is not None and message:
+                        on_message_delta(message)
+                    self.history.append({"role": "assistant", "content": content})
+                    return content
 
-            response = await self.client.chat.completions.create(
+            messages = [{"role": "system", "content": system_message}, *self.history]
+
+            stream = await self.client.chat.completions.create(
                 messages=messages,
                 model="meta-llama/llama-4-maverick-17b-128e-instruct",
                 temperature=0.2,
                 max_completion_tokens=1024,
                 top_p=0.95,
-                stream=False,
+                stream=True,
                 stop=None,
             )
-            self.history.append({"role": "assistant", "content": response.choices[0].message.content})
-            return response.choices[0].message.content
+            content = await self._read_stream(stream, on_message_delta)
+            # Only cache well-formed replies so a malformed one can be retried
+            if any(_extract_tag(content, tag) is not None for tag in _TAG_PATTERNS):
+                self._cache_put(key, content)
+
+            self.history.append({"role": "assistant", "content": content})
+            return content
         except Exception as e:
             logging.error(f"Error occurred during LLM response: {e}")
             return "Error"
 
-    async def process_llm_response(self, llm_response: str) -> dict:
+    def process_llm_response(self, llm_response: str) -> dict:
         """
         Process LLM response and extract structured data.
 
@@ -131,15 +411,16 @@ class LLMInterface:
         try:
             result = {}
 
-            if "<tool_call>" in llm_response:
-                llm_parsed_data = await self._parse_llm_response(llm_response, "tool_call")
+            # Guard on the bare tag name so whitespace-tolerant tags still reach the parser
+            if "tool_call" in llm_response:
+                llm_parsed_data = self._parse_llm_response(llm_response, "tool_call")
                 if llm_parsed_data:
                     result["tool_call"] = True
                     result["tool_call_data"] = llm_parsed_data
                     return result
 
-            if "<user_message>" in llm_response:
-                llm_parsed_data = await self._parse_llm_response(llm_response, "user_message")
+            if "user_message" in llm_response:
+                llm_parsed_data = self._parse_llm_response(llm_response, "user_message")
                 if llm_parsed_data:
                     result["tool_call"] = False
                     result["message_to_user"] = llm_parsed_data
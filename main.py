@@ -1,7 +1,17 @@
 import asyncio
 from pathlib import Path
 from clients.client import start_chat
+from clients.llm_interface import close_client
+
+
+async def main(server_script_path: str):
+    """Run the chat session and release shared clients on exit."""
+    try:
+        await start_chat(server_script_path)
+    finally:
+        await close_client()
+
 if __name__ == "__main__":
     current_dir = Path(__file__).resolve().parent
     server_script_path = f"{current_dir}/servers/server.py"
-    asyncio.run(start_chat(server_script_path))
\ No newline at end of file
+    asyncio.run(main(server_script_path))
\ No newline at end of file
@@ -1,15 +1,100 @@
-import aiohttp
+import time
+import httpx
+import orjson
 import logging
-from typing import Optional, Dict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Dict, Tuple
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import ToolAnnotations
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Shared HTTP/2 client, created lazily on first use and reused by all tools
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first call.
+
+    Returns:
+        httpx.AsyncClient: Client with HTTP/2 enabled and a pooled keep-alive connection set.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _client
+
+
+# Short-lived caches of formatted tool results: key -> (expiry time, result)
+_weather_cache: Dict[str, Tuple[float, str]] = {}
+_metals_cache: Dict[str, Tuple[float, str]] = {}
+_btc_cache: Dict[str, Tuple[float, str]] = {}
+
+WEATHER_TTL = 600
+METALS_TTL = 30
+BTC_TTL = 10
+
+
+def _cache_get(cache: Dict[str, Tuple[float, str]], key: str) -> Optional[str]:
+    """Return a cached value if present and not expired.
+
+    Args:
+        cache (dict): Cache to look up.
+        key (str): Cache key.
+
+    Returns:
+        Optional[str]: Cached value, or None on a miss.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del cache[key]
+        return None
+    return value
+
+
+def _cache_set(cache: Dict[str, Tuple[float, str]], key: str, value: str, ttl: float, maxsize: int = 256) -> None:
+    """Store a value in the cache, evicting the oldest entry when full.
+
+    Args:
+        cache (dict): Cache to update.
+        key (str): Cache key.
+        value (str): Value to store.
+        ttl (float): Time to live in seconds.
+        maxsize (int): Maximum number of entries kept.
+    """
+    cache.pop(key, None)
+    if len(cache) >= maxsize:
+        del cache[next(iter(cache))]
+    cache[key] = (time.monotonic() + ttl, value)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP client when the server shuts down."""
+    try:
+        yield
+    finally:
+        if _client is not None and not _client.is_closed:
+            await _client.aclose()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("My Server")
+mcp = FastMCP("My Server", lifespan=lifespan)
+
+# Marks tools whose output is already user-ready, so clients can show it without an LLM re-query
+PASSTHROUGH = ToolAnnotations(passthrough=True)
 
 
 async def fetch_weather(city: str) -> Optional[Dict]:
@@ -24,38 +109,37 @@ async def fetch_weather(city: str) -> Optional[Dict]:
     url = f"https://wttr.in/{city}?format=j1"
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logging.error(f"Failed to fetch weather data. Status code: {response.status}")
-                    return None
-
-                try:
-                    data = await response.json()
-                except Exception as json_err:
-                    logging.error(f"Error parsing JSON: {json_err}")
-                    return None
-
-                current_condition = data.get("current_condition")
-                if current_condition and isinstance(current_condition, list):
-                    condition = current_condition[0]
-                    return {
-                        "temperature_celsius": condition.get("temp_C"),
-                        "temperature_fahrenheit": condition.get("temp_F"),
-                        "humidity": condition.get("humidity"),
-                        "weather_description": condition.get("weatherDesc", [{}])[0].get("value"),
-                        "wind_speed_kmph": condition.get("windspeedKmph"),
-                        "wind_speed_miles": condition.get("windspeedMiles")
-                    }
-                else:
-                    logging.warning("Missing or malformed 'current_condition' data.")
-                    return None
-
-    except aiohttp.ClientError as e:
+        response = await _get_client().get(url)
+        if response.status_code != 200:
+            logging.error(f"Failed to fetch weather data. Status code: {response.status_code}")
+            return None
+
+        try:
+            data = orjson.loads(response.content)
+        except Exception as json_err:
+            logging.error(f"Error parsing JSON: {json_err}")
+            return None
+
+        current_condition = data.get("current_condition")
+        if current_condition and isinstance(current_condition, list):
+            condition = current_condition[0]
+            return {
+                "temperature_celsius": condition.get("temp_C"),
+                "temperature_fahrenheit": condition.get("temp_F"),
+                "humidity": condition.get("humidity"),
+                "weather_description": condition.get("weatherDesc", [{}])[0].get("value"),
+                "wind_speed_kmph": condition.get("windspeedKmph"),
+                "wind_speed_miles": condition.get("windspeedMiles")
+            }
+        else:
+            logging.warning("Missing or malformed 'current_condition' data.")
+            return None
+
+    except httpx.HTTPError as e:
         logging.error(f"HTTP error occurred while fetching weather data: {e}")
         return None
 
-@mcp.tool()
+@mcp.tool(annotations=PASSTHROUGH)
 async def get_weather(city: str) -> str:
     """Get formatted weather details of a city.
 
@@ -63,27 +147,37 @@ async def get_weather(city: str) -> str:
         city (str): City name (e.g., "Mumbai").
 
     Returns:
-        str: Weather information as a formatted string, or an empty string if data is not available.
+        str: Weather information as a formatted string.
+
+    Raises:
+        ToolError: If weather data is not available.
     """
+    cache_key = city.strip().lower()
+    cached = _cache_get(_weather_cache, cache_key)
+    if cached is not None:
+        return cached
+
     try:
         weather_data = await fetch_weather(city)
-        if weather_data:
-            weather_details = (
-                f"Weather details for {city}:\n"
-                f"Temperature (°C): {weather_data['temperature_celsius']}\n"
-                f"Temperature (°F): {weather_data['temperature_fahrenheit']}\n"
-                f"Humidity: {weather_data['humidity']}%\n"
-                f"Description: {weather_data['weather_description']}\n"
-                f"Wind Speed: {weather_data['wind_speed_kmph']} km/h "
-                f"({weather_data['wind_speed_miles']} mph)"
-            )
-            return weather_details
-        else:
-            logging.info(f"No weather data found for '{city}'")
-            return ""
     except Exception as e:
         logging.error(f"Error occurred while fetching weather data for '{city}': {e}")
-        return ""
+        raise ToolError(f"Failed to fetch weather data for '{city}'.") from e
+
+    if not weather_data:
+        logging.info(f"No weather data found for '{city}'")
+        raise ToolError(f"No weather data found for '{city}'.")
+
+    weather_details = (
+        f"Weather details for {city}:\n"
+        f"Temperature (°C): {weather_data['temperature_celsius']}\n"
+        f"Temperature (°F): {weather_data['temperature_fahrenheit']}\n"
+        f"Humidity: {weather_data['humidity']}%\n"
+        f"Description: {weather_data['weather_description']}\n"
+        f"Wind Speed: {weather_data['wind_speed_kmph']} km/h "
+        f"({weather_data['wind_speed_miles']} mph)"
+    )
+    _cache_set(_weather_cache, cache_key, weather_details, WEATHER_TTL)
+    return weather_details
 
 
 @mcp.tool()
@@ -91,62 +185,79 @@ async def fetch_gold_silver_prices() -> str:
     """Fetch and format latest gold and silver prices in USD per troy ounce.
 
     Returns:
-        str: Formatted price summary including current, previous, and change values for gold and silver,
-             or an error message if data is unavailable.
+        str: Formatted price summary including current, previous, and change values for gold and silver.
+
+    Raises:
+        ToolError: If price data is unavailable.
     """
+    cached = _cache_get(_metals_cache, "USD")
+    if cached is not None:
+        return cached
+
     url = "https://data-asg.goldprice.org/dbXRates/USD"
     headers = {
         "User-Agent": "Mozilla/5.0"
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
-                item = data["items"][0]
-
-                result = {
-                    "currency": item["curr"],
-                    "date_ny": data.get("date", "N/A"),
-                    "gold": {
-                        "current_price": item["xauPrice"],
-                        "previous_close": item["xauClose"],
-                        "change_absolute": item["chgXau"],
-                        "change_percent": item["pcXau"]
-                    },
-                    "silver": {
-                        "current_price": item["xagPrice"],
-                        "previous_close": item["xagClose"],
-                        "change_absolute": item["chgXag"],
-                        "change_percent": item["pcXag"]
-                    }
-                }
-
-                return f"The gold and silver prices are in USD per troy ounce:\n{result}"
+        response = await _get_client().get(url, headers=headers)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        item = data["items"][0]
+
+        result = {
+            "currency": item["curr"],
+            "date_ny": data.get("date", "N/A"),
+            "gold": {
+                "current_price": item["xauPrice"],
+                "previous_close": item["xauClose"],
+                "change_absolute": item["chgXau"],
+                "change_percent": item["pcXau"]
+            },
+            "silver": {
+                "current_price": item["xagPrice"],
+                "previous_close": item["xagClose"],
+                "change_absolute": item["chgXag"],
+                "change_percent": item["pcXag"]
+            }
+        }
+
+        prices = f"The gold and silver prices are in USD per troy ounce:\n{result}"
+        _cache_set(_metals_cache, "USD", prices, METALS_TTL)
+        return prices
 
     except Exception as e:
         logging.error(f"Error fetching price data: {e}")
-        return "Failed to fetch gold/silver prices."
+        raise ToolError("Failed to fetch gold/silver prices.") from e
 
-@mcp.tool()
+@mcp.tool(annotations=PASSTHROUGH)
 async def fetch_bitcoin_price() -> str:
     """Fetch and format the current Bitcoin price in USD.
 
     Returns:
-        str: Bitcoin price as a formatted string, or an error message if data is unavailable.
+        str: Bitcoin price as a formatted string.
+
+    Raises:
+        ToolError: If price data is unavailable.
     """
+    cached = _cache_get(_btc_cache, "usd")
+    if cached is not None:
+        return cached
+
     url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                data = await response.json()
-                price = data["bitcoin"]["usd"]
-                return f"Bitcoin Price in USD: {price}"
+        response = await _get_client().get(url)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        price = data["bitcoin"]["usd"]
+        btc_price = f"Bitcoin Price in USD: {price}"
+        _cache_set(_btc_cache, "usd", btc_price, BTC_TTL)
+        return btc_price
 
     except Exception as e:
         logging.error(f"Error fetching Bitcoin price: {e}")
-        return "Failed to fetch Bitcoin price."
+        raise ToolError("Failed to fetch Bitcoin price.") from e
 
 
 # Initialize and run the server
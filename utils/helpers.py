@@ -1,4 +1,6 @@
+import orjson
 import logging
+from functools import lru_cache
 from typing import Dict
 
 class HelperFunctions:
@@ -15,6 +17,19 @@ class HelperFunctions:
             str: Formatted tool definition string.
         """
         try:
+            # Freeze the schema so the formatted result can be memoized
+            schema_key = orjson.dumps(input_schema, option=orjson.OPT_SORT_KEYS)
+        except TypeError as e:
+            logging.error(f"Error formatting tool schema: {e}")
+            return ""
+        return HelperFunctions._format_tool_cached(tool_name, tool_description, schema_key)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _format_tool_cached(tool_name: str, tool_description: str, schema_key: bytes) -> str:
+        """Memoized implementation of `format_tool` keyed on the frozen schema."""
+        try:
+            input_schema = orjson.loads(schema_key)
             parameters = {}
 
             if input_schema.get("type"):
@@ -32,12 +47,12 @@ class HelperFunctions:
             if input_schema.get("required"):
                 parameters["required"] = input_schema["required"]
 
-            return {
+            return orjson.dumps({
                 "name": tool_name,
                 "description": tool_description,
                 "parameters": parameters
-            }
+            }).decode()
 
         except Exception as e:
             logging.error(f"Error formatting tool schema: {e}")
-            return {}
\ No newline at end of file
+            return ""
\ No newline at end of file